@@ -2,11 +2,17 @@ import sys
 
 raise RuntimeError(
     "This file was renamed to `modem.py` to avoid shadowing the `serial` package.\n"
-    "Please run `python modem.py` (or rename your script)."
+    "Please run `python modem.py` (or rename your script).\n"
+    "Note: modem.py waits for serial data with selectors/epoll for low-latency\n"
+    "RING detection; do not copy the time.sleep(0.1) poll loop from this legacy file."
 )
 
 # NOTE: This module intentionally refuses to run; please migrate to `modem.py` which provides
 # a modern CLI, cross-platform audio player detection, and testable parsing logic.
+# The detect_incoming_call below is kept only as a historical reference. Its
+# sleep-polling loop caps detection latency at 100 ms and burns CPU while idle;
+# modem.py replaces it with a kernel event wait (epoll/select) plus bulk reads.
+# Do not reinstate this pattern.
 
     def __init__(self, port, baudrate=9600):
         self.ser = serial.Serial(port, baudrate, timeout=1)
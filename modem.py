@@ -2,40 +2,138 @@
 
 Replaces the old `import serial.py` script to avoid shadowing the `serial` package.
 """
-import argparse
-import glob
+import fnmatch
+import functools
 import logging
 import os
 import platform
+import queue
+import re
+import select
+import selectors
 import shutil
-import subprocess
 import sys
+import threading
 import time
-from typing import Optional
+from typing import Optional, Union
 
-import serial
+# `serial` (pyserial), `argparse` and `subprocess` are imported lazily at
+# their point of use: pulling in pyserial's platform backends costs tens of
+# milliseconds and none of them are needed for --help or the pure helper
+# functions the tests import.
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# platform.system() can shell out to uname on some platforms; the answer never
+# changes within a process, so resolve it once at import.
+_SYSTEM = platform.system()
+
+
+def _system() -> str:
+    """Return the cached platform name (seam for tests to monkeypatch)."""
+    return _SYSTEM
+
 AUDIO_CANDIDATES = ["afplay", "aplay", "play"]
 
+# Compiled once so the hot detection loop does a single C-level scan over the
+# raw bytes instead of decode + upper() + substring search per line.
+_RING_RE = re.compile(rb"RING", re.IGNORECASE)
+
+# The overwhelmingly common case is a line that is exactly RING; a set lookup
+# is cheaper than running the regex (and, for str input, than encoding first).
+# Kept as separate bytes/str sets: mixing the two in one set triggers
+# bytes-vs-str comparisons (a BytesWarning under python -bb).
+_RING_FAST_BYTES = frozenset({b"RING", b"RING\r", b"RING\n", b"RING\r\n", b"ring"})
+_RING_FAST_STR = frozenset({"RING", "RING\r", "RING\n", "RING\r\n", "ring"})
 
+# AT+VTS commands for the 16 valid DTMF symbols, encoded once at import; the
+# lookup also rejects anything that is not a real tone.
+_DTMF_CMDS = {t: f"AT+VTS={t}\r".encode() for t in "0123456789*#ABCD"}
+
+
+@functools.lru_cache(maxsize=1)
 def choose_audio_player() -> Optional[str]:
-    """Return the first available audio player from known candidates or None."""
+    """Return the first available audio player from known candidates or None.
+
+    The result is memoized: shutil.which walks every PATH entry per
+    candidate, and both main() and USBModemHandler call this. PATH changes
+    made after the first call are not picked up, which is fine for a CLI.
+    """
     for cmd in AUDIO_CANDIDATES:
         if shutil.which(cmd):
             return cmd
     return None
 
 
-def is_ring_line(line: str) -> bool:
+# Device glob patterns per platform, in priority order. detect_default_port
+# tries its patterns first-hit-wins (on macOS explicit discovery is preferred
+# over guessing a name, hence no fallback); list_available_ports shows
+# everything. Windows has no /dev to scan, so listing returns empty and the
+# user must pass COMx explicitly.
+_DETECT_PATTERNS = {
+    "Darwin": ["/dev/cu.usbserial*", "/dev/tty.usbserial*", "/dev/cu.usbmodem*", "/dev/tty.usbmodem*", "/dev/cu.*usb*"],
+    "Linux": ["/dev/ttyUSB*", "/dev/ttyACM*"],
+}
+_DETECT_FALLBACK = {
+    "Linux": "/dev/ttyUSB0",
+    "Windows": "COM1",
+}
+_LIST_PATTERNS = {
+    "Darwin": ["/dev/cu.*", "/dev/tty.*"],
+    "Linux": ["/dev/ttyUSB*", "/dev/ttyACM*", "/dev/serial/by-id/*"],
+}
+
+# Compile every known pattern once at import so repeated auto-detection (e.g.
+# retry loops) does not re-translate the globs.
+_COMPILED_PATTERNS = {}
+for _pats in list(_DETECT_PATTERNS.values()) + list(_LIST_PATTERNS.values()):
+    for _p in _pats:
+        _d, _, _name = _p.rpartition("/")
+        _COMPILED_PATTERNS[_p] = (_d, re.compile(fnmatch.translate(_name)))
+del _pats, _p, _d, _name
+
+
+def _scan_dev(patterns: list) -> dict:
+    """Match glob-style device patterns against one directory scan per directory.
+
+    Equivalent to running glob.glob over each pattern, but each directory is
+    read only once and the patterns are applied as precompiled in-memory
+    matchers. Returns a dict mapping each pattern to its sorted matching paths.
+    """
+    entries = {}
+    results = {}
+    for p in patterns:
+        directory, rx = _COMPILED_PATTERNS.get(p) or (None, None)
+        if rx is None:
+            directory, _, name = p.rpartition("/")
+            rx = re.compile(fnmatch.translate(name))
+        if directory not in entries:
+            try:
+                with os.scandir(directory) as it:
+                    entries[directory] = [e.name for e in it]
+            except OSError:
+                entries[directory] = []
+        results[p] = sorted(f"{directory}/{e}" for e in entries[directory] if rx.match(e))
+    return results
+
+
+def is_ring_line(line: Union[bytes, str]) -> bool:
     """Return True if the modem line indicates an incoming call (RING).
 
-    This is intentionally small and testable.
+    Accepts the raw bytes straight off the serial port (no decode needed) as
+    well as str for convenience. This is intentionally small and testable.
     """
     if not line:
         return False
-    return "RING" in line.upper()
+    if isinstance(line, str):
+        if line in _RING_FAST_STR:
+            return True
+        line = line.encode("ascii", "ignore")
+    elif isinstance(line, bytes) and line in _RING_FAST_BYTES:
+        # bytearray input skips the fast path (unhashable) and goes straight
+        # to the regex, which handles it fine.
+        return True
+    return _RING_RE.search(line) is not None
 
 
 def detect_default_port() -> Optional[str]:
@@ -43,48 +141,24 @@ def detect_default_port() -> Optional[str]:
 
     Returns the first matching device path or a sensible fallback (or None if unknown).
     """
-    system = platform.system()
-    patterns = []
-    fallback = None
-
-    if system == "Darwin":
-        patterns = ["/dev/cu.usbserial*", "/dev/tty.usbserial*", "/dev/cu.usbmodem*", "/dev/tty.usbmodem*", "/dev/cu.*usb*"]
-        # On macOS prefer explicit device discovery over guessing a name
-        fallback = None
-    elif system == "Linux":
-        patterns = ["/dev/ttyUSB*", "/dev/ttyACM*"]
-        fallback = "/dev/ttyUSB0"
-    elif system == "Windows":
-        # Simple fallback for Windows
-        patterns = []
-        fallback = "COM1"
-
-    matches = []
+    system = _system()
+    patterns = _DETECT_PATTERNS.get(system, [])
+    hits = _scan_dev(patterns)
     for p in patterns:
-        m = glob.glob(p)
-        matches.extend(m)
-        if m:
+        if hits[p]:
             # return the first match found for predictable behavior
-            return m[0]
+            return hits[p][0]
 
-    return fallback
+    return _DETECT_FALLBACK.get(system)
 
 
 def list_available_ports() -> list:
     """Return a list of available serial device paths using platform patterns."""
-    system = platform.system()
-    patterns = []
-    if system == "Darwin":
-        patterns = ["/dev/cu.*", "/dev/tty.*"]
-    elif system == "Linux":
-        patterns = ["/dev/ttyUSB*", "/dev/ttyACM*", "/dev/serial/by-id/*"]
-    elif system == "Windows":
-        # Windows listing is not implemented here; return empty (user must pass COMx)
-        return []
-
+    patterns = _LIST_PATTERNS.get(_system(), [])
+    hits = _scan_dev(patterns)
     ports = []
     for p in patterns:
-        ports.extend(sorted(glob.glob(p)))
+        ports.extend(hits[p])
     return ports
 
 
@@ -103,82 +177,292 @@ def prompt_select_port(choices: list, input_fn=input) -> Optional[str]:
 
     while True:
         sel = input_fn("Select device by number and press Enter (or just Enter to cancel): ")
-        if sel.strip() == "":
+        s = sel.strip()
+        if s == "":
             return None
-        try:
-            n = int(sel.strip())
-            if 1 <= n <= len(choices):
-                return choices[n - 1]
-            else:
-                print(f"Invalid selection: {sel}. Please enter a number between 1 and {len(choices)} or Enter to cancel.")
-        except ValueError:
+        # Validate up front rather than catching ValueError: typos are the
+        # common path here and exception setup/teardown is far costlier than
+        # an isdecimal() check (isdecimal matches exactly what int() accepts,
+        # unlike isdigit, which also passes superscripts and the like).
+        if not s.isdecimal():
             print(f"Invalid input: {sel}. Please enter a number or press Enter to cancel.")
+            continue
+        n = int(s)
+        if 1 <= n <= len(choices):
+            return choices[n - 1]
+        print(f"Invalid selection: {sel}. Please enter a number between 1 and {len(choices)} or Enter to cancel.")
 
 
 class USBModemHandler:
-    def __init__(self, port: str, baudrate: int = 9600, audio_player: Optional[str] = None):
+    def __init__(self, port: str, baudrate: int = 9600, audio_player: Optional[str] = None,
+                 rx_buffer_size: int = 65536):
+        import serial
+
         self.port = port
         self.baudrate = baudrate
+        self.rx_buffer_size = rx_buffer_size
         # Validate and open serial port with helpful error messages on failure
         try:
             self.ser = serial.Serial(port, baudrate, timeout=1)
         except Exception as e:
             logging.error("Failed to open serial port %s: %s", port, e)
             if isinstance(e, PermissionError) or "permission" in str(e).lower():
-                if platform.system() == "Linux":
+                if _system() == "Linux":
                     logging.error("Permission denied opening %s. Try: add a udev rule, add your user to the 'dialout' group, or run with sudo.", port)
-                elif platform.system() == "Darwin":
+                elif _system() == "Darwin":
                     logging.error("Permission denied opening %s. Check device permissions or try running with sudo.", port)
             raise
 
-        time.sleep(2)  # Wait for modem initialization
+        # Grow the driver-side RX buffer so message bursts at high baud
+        # rates are not dropped between reader wakes. Only Windows exposes
+        # this through pyserial; on POSIX the kernel tty buffer is fixed
+        # (typically 64 KiB already) and the reader thread draining on every
+        # wake keeps it from filling.
+        if _system() == "Windows":
+            try:
+                self.ser.set_buffer_size(rx_size=rx_buffer_size, tx_size=8192)
+            except (AttributeError, OSError, ValueError) as e:
+                logging.debug("Could not set serial buffer size: %s", e)
+
+        # Register the serial fd with the kernel so we can block instead of
+        # sleep-polling. On Linux use edge-triggered epoll: O(1) per wait and
+        # exactly one wake per new-data edge (the loop must then drain the
+        # buffer fully). Elsewhere fall back to a portable selector; on
+        # Windows pyserial handles are not selectable, so the old poll loop
+        # remains as a last resort.
+        self._sel = None
+        self._ep = None
+        self._rxbuf = bytearray()  # partial line carried between reads
+        # Self-pipe registered alongside the serial fd: writing a byte wakes
+        # the reader thread immediately (close() uses this) instead of it
+        # waiting out a poll timeout.
+        self._wake_r, self._wake_w = os.pipe()
+        system = _system()
+        if system == "Linux":
+            try:
+                self._ep = select.epoll()
+                self._ep.register(self.ser.fileno(), select.EPOLLIN | select.EPOLLET)
+                self._ep.register(self._wake_r, select.EPOLLIN)
+            except (OSError, ValueError):
+                self._ep = None
+        elif system != "Windows":
+            try:
+                self._sel = selectors.DefaultSelector()
+                self._sel.register(self.ser.fileno(), selectors.EVENT_READ)
+                self._sel.register(self._wake_r, selectors.EVENT_READ)
+            except (OSError, ValueError):
+                self._sel = None
+
+        # A dedicated reader thread owns the selector and pushes complete
+        # lines onto a bounded queue; reads happen as soon as the kernel
+        # reports data, even while the main thread is mid-command or playing
+        # audio, so RING detection latency no longer depends on what the
+        # main loop is doing.
+        self._lines = queue.Queue(maxsize=256)
+        self._stop = threading.Event()
+        self._rx_error = None  # set by the reader thread before it dies
+        self._rx_thread = threading.Thread(target=self._rx_loop, daemon=True)
+        self._rx_thread.start()
+
+        # Probe the modem instead of sleeping a fixed 2 s: send AT until it
+        # answers OK (fast modems are ready in well under 200 ms), then
+        # disable echo and wait for that to be acknowledged too.
+        for _ in range(10):
+            self.ser.write(b"AT\r")
+            if self._wait_for_ok(0.2):
+                break
+        else:
+            logging.warning("Modem did not answer AT probe; continuing anyway")
         self.ser.write(b"ATE0\r")  # Disable echo
-        time.sleep(0.5)
+        self._wait_for_ok(0.5)
         self.audio_player = audio_player or choose_audio_player()
         logging.info("Using audio player: %s", self.audio_player)
 
+    def _rx_loop(self):
+        """Reader thread: block on the kernel for serial data and queue lines.
+
+        Runs until close() sets the stop event and pokes the self-pipe,
+        which interrupts the kernel wait immediately. Each wake drains everything
+        buffered in bulk reads (required by edge-triggered epoll and cheaper
+        than byte-at-a-time readline()) and pushes complete lines as raw
+        bytes; a full queue drops the line with a warning rather than
+        blocking the reader.
+        """
+        ser_fd = self.ser.fileno() if (self._ep is not None or self._sel is not None) else None
+        while not self._stop.is_set():
+            try:
+                ready = ()
+                if self._ep is not None:
+                    ready = [fd for fd, _ in self._ep.poll(-1)]
+                elif self._sel is not None:
+                    ready = [key.fd for key, _ in self._sel.select(timeout=None)]
+                elif not self.ser.in_waiting:
+                    # Fallback poll for platforms without a selectable serial fd.
+                    time.sleep(0.1)
+                    continue
+                if self._wake_r in ready:
+                    # Self-pipe wake: re-check the stop flag right away.
+                    os.read(self._wake_r, 64)
+                    if self._stop.is_set():
+                        break
+                    if ser_fd not in ready:
+                        continue
+                self._rxbuf += self.ser.read(self.ser.in_waiting or 1)
+                while self.ser.in_waiting:
+                    self._rxbuf += self.ser.read(self.ser.in_waiting)
+            except (OSError, ValueError) as e:
+                # Expected during shutdown (close() pulls the fd out from
+                # under us); anything else means the device went away, which
+                # consumers must hear about instead of blocking forever.
+                if not self._stop.is_set():
+                    logging.error("Serial port error while reading: %s", e)
+                    self._rx_error = e
+                    self._put_sentinel()
+                break
+            for raw in self._pop_lines():
+                try:
+                    self._lines.put_nowait(raw)
+                except queue.Full:
+                    logging.warning("RX line queue full; dropping %r", raw)
+
+    def _put_sentinel(self):
+        """Queue the reader-died marker, evicting the oldest line if full."""
+        while True:
+            try:
+                self._lines.put_nowait(None)
+                return
+            except queue.Full:
+                try:
+                    self._lines.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _wait_for_ok(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for an OK/CONNECT response from the modem.
+
+        Returns as soon as the response line arrives instead of sleeping a
+        fixed worst-case delay. Unrelated lines received while waiting are
+        consumed. Raises RuntimeError if the reader thread has died.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                raw = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                return False
+            if raw is None:
+                raise RuntimeError("Serial reader stopped: %s" % self._rx_error) from self._rx_error
+            if b"OK" in raw or b"CONNECT" in raw:
+                return True
+
     def detect_incoming_call(self) -> bool:
         """Monitor for incoming call notifications."""
-        logging.info("Listening for incoming calls on %s...", self.port)
+        log = logging.getLogger()
+        log.info("Listening for incoming calls on %s...", self.port)
+        # Resolve the debug check once: at INFO (the default) this skips the
+        # whole logging dispatch for every received line.
+        dbg = log.isEnabledFor(logging.DEBUG)
+        while True:
+            raw = self._lines.get()
+            if raw is None:
+                # Reader thread died (e.g. the device was unplugged): fail
+                # loudly rather than waiting forever on an empty queue.
+                raise RuntimeError("Serial reader stopped: %s" % self._rx_error) from self._rx_error
+            if dbg:
+                log.debug("Got line: %r", raw)
+            if is_ring_line(raw):
+                return True
+
+    def _pop_lines(self):
+        """Yield complete lines from the receive buffer, keeping any partial tail."""
         while True:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode(errors="ignore").strip()
-                logging.debug("Got line: %r", line)
-                if is_ring_line(line):
-                    return True
-            time.sleep(0.1)
+            ends = [i for i in (self._rxbuf.find(b"\r"), self._rxbuf.find(b"\n")) if i != -1]
+            if not ends:
+                return
+            cut = min(ends)
+            raw = bytes(self._rxbuf[:cut])
+            del self._rxbuf[:cut + 1]
+            if raw:
+                yield raw
 
     def pickup_call(self):
         """Answer incoming call."""
         self.ser.write(b"ATA\r")
-        time.sleep(0.5)
+        if not self._wait_for_ok(0.5):
+            logging.warning("No response to ATA within 0.5s")
         logging.info("Call answered")
 
-    def play_recording(self, audio_file: str):
-        """Play audio file using detected platform audio player."""
+    def play_recording(self, audio_file: str) -> "subprocess.Popen":
+        """Play audio file using detected platform audio player.
+
+        Starts the player without blocking and returns the Popen handle so
+        the caller can keep servicing the serial port while audio plays.
+        """
+        import subprocess
+
         if not self.audio_player:
             raise RuntimeError("No audio player found on PATH (tried: %s)" % ", ".join(AUDIO_CANDIDATES))
-        subprocess.run([self.audio_player, audio_file], check=False)
+        return subprocess.Popen(
+            [self.audio_player, audio_file],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
 
     def send_dtmf(self, tone: str):
         """Send DTMF tone."""
-        command = f"AT+VTS={tone}\r".encode()
+        try:
+            command = _DTMF_CMDS[tone]
+        except KeyError:
+            raise ValueError(f"Invalid DTMF tone: {tone!r} (expected one of 0-9, *, # or A-D)") from None
         self.ser.write(command)
-        time.sleep(0.3)
+        if not self._wait_for_ok(0.5):
+            logging.warning("No response to AT+VTS=%s within 0.5s", tone)
         logging.info("Sent DTMF: %s", tone)
 
     def hangup(self):
         """Terminate call."""
         self.ser.write(b"ATH\r")
-        time.sleep(0.5)
+        if not self._wait_for_ok(0.5):
+            logging.warning("No response to ATH within 0.5s")
         logging.info("Call ended")
 
     def close(self):
         """Close serial connection."""
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+        if self._rx_thread.is_alive():
+            self._rx_thread.join(timeout=1.0)
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if self._ep is not None:
+            try:
+                self._ep.unregister(self.ser.fileno())
+            except (KeyError, OSError, ValueError):
+                pass
+            self._ep.close()
+            self._ep = None
+        if self._sel is not None:
+            try:
+                self._sel.unregister(self.ser.fileno())
+            except (KeyError, OSError, ValueError):
+                pass
+            self._sel.close()
+            self._sel = None
         self.ser.close()
 
 
 def parse_args(argv):
+    import argparse
+
     parser = argparse.ArgumentParser(description="USB modem controller")
     parser.add_argument("--port", default="/dev/ttyUSB0", help="Serial port to use")
     parser.add_argument("--baud", type=int, default=9600, help="Baud rate")
@@ -222,7 +506,10 @@ def main(argv=None):
             modem.pickup_call()
             time.sleep(1)
             if not args.no_audio:
-                modem.play_recording(args.audio)
+                proc = modem.play_recording(args.audio)
+                # The reader thread keeps draining the modem while audio
+                # plays; communicate() blocks until the player exits.
+                proc.communicate()
             modem.send_dtmf(args.dtmf)
             modem.hangup()
     finally:
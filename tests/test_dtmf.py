@@ -0,0 +1,38 @@
+import queue
+
+import pytest
+
+import modem
+
+
+class FakeSerial:
+    """Records writes; enough of the pyserial surface for send_dtmf."""
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+def make_handler():
+    """Build a USBModemHandler around a fake port, skipping __init__."""
+    handler = modem.USBModemHandler.__new__(modem.USBModemHandler)
+    handler.ser = FakeSerial()
+    handler._lines = queue.Queue()
+    handler._lines.put(b"OK")
+    return handler
+
+
+def test_send_dtmf_writes_precomputed_command():
+    handler = make_handler()
+    handler.send_dtmf("5")
+    assert handler.ser.written == [b"AT+VTS=5\r"]
+
+
+def test_send_dtmf_rejects_unknown_tones():
+    handler = make_handler()
+    for tone in ("Z", "12", ""):
+        with pytest.raises(ValueError):
+            handler.send_dtmf(tone)
+    assert handler.ser.written == []
@@ -13,3 +13,16 @@ def test_is_ring_line_false():
     assert not is_ring_line("")
     assert not is_ring_line("NO CARRIER")
     assert not is_ring_line("some other text")
+
+
+def test_is_ring_line_bytes_basic():
+    # detect_incoming_call passes raw bytes straight off the port
+    assert is_ring_line(b"RING")
+    assert is_ring_line(b"  ring  ")
+    assert is_ring_line(b"+CMTI: \"SM\",1\r\nRING\r\n")
+
+
+def test_is_ring_line_bytes_false():
+    assert not is_ring_line(b"")
+    assert not is_ring_line(b"NO CARRIER")
+    assert not is_ring_line(b"some other text")
@@ -1,4 +1,3 @@
-import platform
 import types
 
 import pytest
@@ -7,18 +6,18 @@ import modem
 
 
 def test_detect_default_port_linux(monkeypatch):
-    monkeypatch.setattr(platform, 'system', lambda: 'Linux')
-    monkeypatch.setattr('glob.glob', lambda pattern: ['/dev/ttyUSB0'] if 'ttyUSB' in pattern else [])
+    monkeypatch.setattr(modem, '_system', lambda: 'Linux')
+    monkeypatch.setattr(modem, '_scan_dev', lambda patterns: {p: (['/dev/ttyUSB0'] if 'ttyUSB' in p else []) for p in patterns})
     assert modem.detect_default_port() == '/dev/ttyUSB0'
 
 
 def test_detect_default_port_macos(monkeypatch):
-    monkeypatch.setattr(platform, 'system', lambda: 'Darwin')
-    monkeypatch.setattr('glob.glob', lambda pattern: ['/dev/cu.usbserial-XYZ'] if 'cu.usbserial' in pattern else [])
+    monkeypatch.setattr(modem, '_system', lambda: 'Darwin')
+    monkeypatch.setattr(modem, '_scan_dev', lambda patterns: {p: (['/dev/cu.usbserial-XYZ'] if 'cu.usbserial' in p else []) for p in patterns})
     assert modem.detect_default_port() == '/dev/cu.usbserial-XYZ'
 
 
 def test_detect_default_port_none(monkeypatch):
-    monkeypatch.setattr(platform, 'system', lambda: 'Darwin')
-    monkeypatch.setattr('glob.glob', lambda pattern: [])
+    monkeypatch.setattr(modem, '_system', lambda: 'Darwin')
+    monkeypatch.setattr(modem, '_scan_dev', lambda patterns: {p: [] for p in patterns})
     assert modem.detect_default_port() is None